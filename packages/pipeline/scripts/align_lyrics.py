@@ -6,10 +6,22 @@ Dependencies: whisperx, torch
 
 Input: {"audioPath": "/path/to/song.mp3", "lyrics": "Long distance runner...", "language": "en", "model": "large-v3"}
 Output: {"ok": true, "words": [...], "segments": [...]}
+
+By default the audio is transcribed first (lyrics become the decoding
+prompt) and the transcript segments are force-aligned. Set "transcribe":
+false to skip the Whisper pass and align the lyrics text directly over
+coarse, length-proportional spans — only suitable when the vocals run
+roughly the whole track (no long instrumental intro or jam).
+
+With --persistent, stays alive and reads one JSON config per stdin line,
+writing one JSON result per stdout line. Loaded models are kept in memory
+across requests, so only the first song pays the model-load cost.
 """
 import sys
 import json
 import os
+import re
+from functools import lru_cache
 
 # Suppress noisy warnings before importing heavy libs
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
@@ -21,6 +33,74 @@ try:
 except ImportError:
     pass
 
+
+@lru_cache(maxsize=2)
+def _load_asr_model(model_name, device, compute_type):
+    import whisperx
+    return whisperx.load_model(model_name, device, compute_type=compute_type)
+
+
+@lru_cache(maxsize=2)
+def _load_align_model(language, device):
+    import whisperx
+    return whisperx.load_align_model(language_code=language, device=device)
+
+
+# (language, requested device) -> device the align model actually loaded on.
+# lru_cache doesn't cache exceptions, so without this a failing MPS load
+# would be retried on every --persistent request before falling back.
+_ALIGN_DEVICE = {}
+
+
+def _load_align_model_with_fallback(language, device):
+    """Load the alignment model on device, falling back to CPU if that fails.
+
+    Returns (align_model, metadata, device_used).
+    """
+    key = (language, device)
+    if key not in _ALIGN_DEVICE:
+        try:
+            _load_align_model(language, device)
+            _ALIGN_DEVICE[key] = device
+        except Exception:
+            _ALIGN_DEVICE[key] = "cpu"
+    used = _ALIGN_DEVICE[key]
+    align_model, metadata = _load_align_model(language, used)
+    return align_model, metadata, used
+
+
+def _with_initial_prompt(model, prompt):
+    """Point a cached model's decoding options at this song's lyrics.
+
+    faster-whisper's TranscriptionOptions is a NamedTuple in older releases
+    and a dataclass in newer ones.
+    """
+    import dataclasses
+    if dataclasses.is_dataclass(model.options):
+        model.options = dataclasses.replace(model.options, initial_prompt=prompt)
+    else:
+        model.options = model.options._replace(initial_prompt=prompt)
+    return model
+
+
+def lyrics_to_segments(lyrics, duration):
+    """Split lyrics into line/sentence segments with linearly spread spans.
+
+    Spans are proportional to each segment's text length over the whole
+    duration. whisperx.align only places words inside their segment's span,
+    so this is only as accurate as that spread — see "transcribe" above.
+    """
+    texts = [t.strip() for t in re.split(r"\n+|(?<=[.!?])\s+", lyrics) if t.strip()]
+    total_chars = sum(len(t) for t in texts) or 1
+    segments = []
+    start = 0.0
+    for text in texts:
+        end = start + duration * len(text) / total_chars
+        segments.append({"text": text, "start": round(start, 3), "end": round(end, 3)})
+        start = end
+    return segments
+
+
 def align(config):
     # Redirect stdout to stderr during alignment so whisperx log noise
     # doesn't corrupt the JSON output on stdout
@@ -57,29 +137,26 @@ def align(config):
     else:
         align_device = "cpu"
 
-    # Step 1: Load WhisperX model and transcribe with lyrics as vocabulary hint
-    asr_options = {"initial_prompt": lyrics}
-    model = whisperx.load_model(
-        model_name, transcribe_device, compute_type=compute_type,
-        asr_options=asr_options
-    )
+    # Step 1: Build segments to align. Transcription locates the sung
+    # passages; "transcribe": false skips the Whisper decode and aligns the
+    # lyrics text over length-proportional spans instead.
     audio = whisperx.load_audio(audio_path)
+    if config.get("transcribe", True):
+        # Transcribe with lyrics as vocabulary hint
+        model = _with_initial_prompt(
+            _load_asr_model(model_name, transcribe_device, compute_type), lyrics
+        )
+        segments_in = model.transcribe(audio, language=language)["segments"]
+    else:
+        from whisperx.audio import SAMPLE_RATE
+        duration = len(audio) / SAMPLE_RATE
+        segments_in = lyrics_to_segments(lyrics, duration)
 
-    result = model.transcribe(audio, language=language)
-
-    # Step 2: Force-align transcription to audio
+    # Step 2: Force-align segments to audio
     # MPS may not be supported for wav2vec2 — gracefully fall back to CPU
-    try:
-        align_model, metadata = whisperx.load_align_model(
-            language_code=language, device=align_device
-        )
-    except Exception:
-        align_device = "cpu"
-        align_model, metadata = whisperx.load_align_model(
-            language_code=language, device=align_device
-        )
+    align_model, metadata, align_device = _load_align_model_with_fallback(language, align_device)
     aligned = whisperx.align(
-        result["segments"], align_model, metadata, audio, align_device,
+        segments_in, align_model, metadata, audio, align_device,
         return_char_alignments=False
     )
 
@@ -112,9 +189,26 @@ def align(config):
     return {"ok": True, "words": words, "segments": segments}
 
 
+def serve(out):
+    """Persistent mode: one JSON config per stdin line, one JSON result per line."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            result = align(json.loads(line))
+        except Exception as e:
+            sys.stdout = out
+            result = {"ok": False, "error": str(e)}
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+
 if __name__ == "__main__":
     # Save original stdout before anything can redirect it
     _original_stdout = sys.stdout
+    if "--persistent" in sys.argv:
+        serve(_original_stdout)
+        sys.exit(0)
     try:
         config = json.loads(sys.stdin.read())
         result = align(config)
@@ -13,31 +13,42 @@ import numpy as np
 import librosa
 
 
-def estimate_key(chroma_vector):
-    """Krumhansl-Schmuckler key-finding algorithm."""
-    major_profile = np.array(
-        [6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
-    )
-    minor_profile = np.array(
-        [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
-    )
-    note_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+# Krumhansl-Schmuckler key profiles, z-scored once so per-call correlation
+# reduces to a single matmul against the 12 chroma rotations.
+MAJOR_PROFILE = np.array(
+    [6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
+)
+MINOR_PROFILE = np.array(
+    [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
+)
+NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+MODE_NAMES = ["major", "minor"]
+
+_PROFILES_Z = np.stack([
+    (MAJOR_PROFILE - MAJOR_PROFILE.mean()) / MAJOR_PROFILE.std(),
+    (MINOR_PROFILE - MINOR_PROFILE.mean()) / MINOR_PROFILE.std(),
+])  # (2, 12)
+# _ROTATION_IDX[i] gathers np.roll(chroma, -i)
+_ROTATION_IDX = (np.arange(12)[:, None] + np.arange(12)) % 12
 
-    best_corr = -2
-    best_key = "C major"
 
-    for i in range(12):
-        rotated = np.roll(chroma_vector, -i)
-        corr_major = float(np.corrcoef(rotated, major_profile)[0, 1])
-        corr_minor = float(np.corrcoef(rotated, minor_profile)[0, 1])
-        if corr_major > best_corr:
-            best_corr = corr_major
-            best_key = f"{note_names[i]} major"
-        if corr_minor > best_corr:
-            best_corr = corr_minor
-            best_key = f"{note_names[i]} minor"
+def estimate_key(chroma_vector):
+    """Krumhansl-Schmuckler key-finding algorithm.
+
+    Pearson correlation of every chroma rotation against both profiles,
+    computed as one (12, 12) @ (12, 2) product of z-scores.
+    """
+    rot = np.asarray(chroma_vector, dtype=np.float64)[_ROTATION_IDX]
+    std = rot.std(axis=1, keepdims=True)
+    if not np.all(std > 0):
+        # Flat chroma (silence) — correlation is undefined
+        return "C major"
+    z = (rot - rot.mean(axis=1, keepdims=True)) / std
+    corr = z @ _PROFILES_Z.T / 12.0  # (12 tonics, 2 modes)
 
-    return best_key
+    # Row-major argmax keeps the loop's tie-break: lowest tonic, major first
+    tonic, mode = np.unravel_index(corr.argmax(), corr.shape)
+    return f"{NOTE_NAMES[tonic]} {MODE_NAMES[mode]}"
 
 
 def analyze(config):
@@ -49,7 +60,7 @@ def analyze(config):
     )
 
     # Load audio (mono, resampled to sr)
-    y, sr = librosa.load(path, sr=sr, mono=True)
+    y, sr = librosa.load(path, sr=sr, mono=True, dtype=np.float32)
     duration = librosa.get_duration(y=y, sr=sr)
 
     result = {"ok": True, "durationSec": round(float(duration), 2)}
@@ -57,7 +68,8 @@ def analyze(config):
     if "energy" in requested:
         rms = librosa.feature.rms(y=y, hop_length=hop)[0]
         max_rms = float(rms.max()) if rms.max() > 0 else 1.0
-        result["energy"] = (rms / max_rms).round(4).tolist()
+        # Round in float64 so float32 features serialize as 0.5628, not 0.5627999901771545
+        result["energy"] = (rms.astype(np.float64) / max_rms).round(4).tolist()
 
     if "tempo" in requested:
         tempo = librosa.beat.tempo(y=y, sr=sr, hop_length=hop)
@@ -66,7 +78,7 @@ def analyze(config):
     if "spectral" in requested:
         cent = librosa.feature.spectral_centroid(y=y, sr=sr, hop_length=hop)[0]
         nyquist = sr / 2.0
-        result["spectralCentroid"] = (cent / nyquist).round(4).tolist()
+        result["spectralCentroid"] = (cent.astype(np.float64) / nyquist).round(4).tolist()
 
     if "onsets" in requested:
         onset_frames = librosa.onset.onset_detect(y=y, sr=sr, hop_length=hop)
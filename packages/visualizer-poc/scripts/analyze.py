@@ -10,16 +10,32 @@ Usage:
   python analyze.py                                          # Morning Dew only (default)
   python analyze.py /path/to/track.mp3 out.json              # Arbitrary track
   python analyze.py /path/to/track.mp3 out.json /stems/dir   # With stem features
+
+Set DEAD_AIR_PACKED_FEATURES=1 to also write out.packed.json: the 0-1
+visualizer features quantized to uint16 (chroma/contrast to uint8) as
+base64 blobs, ready for direct typed-array / texture upload.
 """
 
+import base64
 import json
 import os
 import sys
 from pathlib import Path
 
+# Persist librosa's numba-compiled kernels on disk so later runs and worker
+# processes load them instead of re-JITting (read when numba first imports)
+os.environ.setdefault("NUMBA_CACHE_DIR", str(Path.home() / ".cache" / "dead-air" / "numba"))
+
 import librosa
 import numpy as np
-from sklearn.cluster import AgglomerativeClustering
+from scipy.signal import find_peaks
+
+# orjson serializes the frame array ~5-10x faster than the stdlib encoder;
+# fall back to json when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Support env var overrides for Docker (fall back to relative paths for local dev)
 _AUDIO_DIR_ENV = os.environ.get("DEAD_AIR_AUDIO_DIR")
@@ -31,7 +47,89 @@ DEFAULT_OUTPUT = (Path(_DATA_DIR_ENV) if _DATA_DIR_ENV else Path(__file__).resol
 
 SR = 22050
 HOP_LENGTH = 735  # 22050 / 30 = 735 samples per frame
+N_FFT = 2048
 FPS = 30
+# sub / low / mid / high bands are the contiguous [lo, hi) Hz ranges between these edges
+ENERGY_BAND_EDGES = [0, 100, 400, 2000, 8000]
+# STFT columns per streamed chunk (~30 s of audio)
+CHUNK_FRAMES = 30 * FPS
+
+# STFT bin frequencies and band bin ranges depend only on (SR, N_FFT)
+FFT_FREQS = librosa.fft_frequencies(sr=SR, n_fft=N_FFT)
+BAND_EDGE_BINS = np.searchsorted(FFT_FREQS, ENERGY_BAND_EDGES)
+
+NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+
+def _chord_templates() -> tuple[list, np.ndarray]:
+    """24 chord templates (12 major + 12 minor) and their names."""
+    major_template = np.array([1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0], dtype=float)
+    minor_template = np.array([1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0], dtype=float)
+    chord_names = []
+    chord_templates = []
+    for i in range(12):
+        chord_templates.append(np.roll(major_template, i))
+        chord_names.append(f"{NOTE_NAMES[i]}")
+        chord_templates.append(np.roll(minor_template, i))
+        chord_names.append(f"{NOTE_NAMES[i]}m")
+    chord_templates = np.array(chord_templates)  # (24, 12)
+
+    # Unit-normalize the templates so the dot product against a unit-normalized
+    # chroma vector is true cosine similarity, bounded in [0, 1] for non-negative
+    # inputs. Without this normalization the templates have L2 norm sqrt(3) and
+    # scores reach ~1.73 — confidence bleeds past 1.0 (mean 1.19 on Veneta), all
+    # downstream `> 0.3` / `> 0.6` thresholds become meaningless, and the
+    # smoothstep(0.3, 0.6, x) used in 8 shaders saturates regardless of true
+    # match quality. argmax is preserved (uniform scaling doesn't change ranking).
+    chord_template_norms = np.linalg.norm(chord_templates, axis=1, keepdims=True)
+    return chord_names, chord_templates / (chord_template_norms + 1e-8)
+
+
+CHORD_NAMES, CHORD_TEMPLATES_N = _chord_templates()
+
+# Krumhansl-Schmuckler key profiles, z-scored once so each window's 24
+# correlations reduce to one (12, 12) @ (12, 2) product
+KS_MAJOR = np.array(
+    [6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
+)
+KS_MINOR = np.array(
+    [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
+)
+KS_PROFILES_Z = np.stack([
+    (KS_MAJOR - KS_MAJOR.mean()) / KS_MAJOR.std(),
+    (KS_MINOR - KS_MINOR.mean()) / KS_MINOR.std(),
+])  # (2, 12): major, minor
+# _KS_ROTATION_IDX[i] gathers np.roll(chroma, -i)
+_KS_ROTATION_IDX = (np.arange(12)[:, None] + np.arange(12)) % 12
+
+
+def load_audio(path: Path) -> np.ndarray:
+    """Decode to mono float32 at SR."""
+    y, _ = librosa.load(str(path), sr=SR, mono=True, dtype=np.float32)
+    return y
+
+
+def warm_up() -> None:
+    """Trigger numba JIT for the librosa kernels analyze_track uses.
+
+    Runs the same feature calls on one second of low-level noise, so a fresh
+    worker process pays compilation (or cache load) before its first track.
+    """
+    y = (np.random.default_rng(0).standard_normal(SR) * 1e-3).astype(np.float32)
+    mel_db = librosa.power_to_db(spectral_features(y)["mel"])
+    onset_env = librosa.onset.onset_strength(S=mel_db, sr=SR, hop_length=HOP_LENGTH)
+    librosa.beat.beat_track(onset_envelope=onset_env, sr=SR, hop_length=HOP_LENGTH)
+    librosa.feature.rms(y=y, hop_length=HOP_LENGTH)
+    librosa.feature.mfcc(S=mel_db, n_mfcc=13)
+
+
+def write_json(path: Path, obj) -> None:
+    """Write obj as compact JSON, via orjson when available."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, "w") as f:
+        json.dump(obj, f)
 
 
 def normalize(arr: np.ndarray) -> np.ndarray:
@@ -42,75 +140,182 @@ def normalize(arr: np.ndarray) -> np.ndarray:
     return (arr - mn) / (mx - mn)
 
 
-def band_energy(S: np.ndarray, freqs: np.ndarray, lo: float, hi: float) -> np.ndarray:
-    """Sum spectral energy in a frequency band per frame."""
-    mask = (freqs >= lo) & (freqs < hi)
-    if not mask.any():
-        return np.zeros(S.shape[1])
-    return S[mask, :].sum(axis=0)
-
-
-def detect_sections(y: np.ndarray, sr: int, n_frames: int, rms_norm: np.ndarray) -> list:
-    """Detect song sections via agglomerative clustering on MFCC features."""
+def normalize_rows(arr: np.ndarray) -> np.ndarray:
+    """Min-max normalize each row of a 2D array to 0-1 independently."""
+    mn = arr.min(axis=1, keepdims=True)
+    rng = arr.max(axis=1, keepdims=True) - mn
+    flat = rng < 1e-10
+    out = (arr - mn) / np.where(flat, 1.0, rng)
+    out[flat[:, 0]] = 0.0
+    return out
+
+
+def band_energy(S: np.ndarray) -> np.ndarray:
+    """(n_bands, n_frames) sums of S over the ENERGY_BAND_EDGES bin ranges.
+
+    STFT bins are sorted by frequency, so each band is a contiguous row range
+    and one reduceat sums them all, reading only rows below the top edge. The
+    top edge is passed as a split too and its open-ended tail sum dropped.
+    """
+    return np.add.reduceat(S[:BAND_EDGE_BINS[-1] + 1], BAND_EDGE_BINS, axis=0)[:-1]
+
+
+def stft_chunk_buffer() -> np.ndarray:
+    """Complex64 scratch buffer for one CHUNK_FRAMES-column STFT chunk."""
+    return np.empty((1 + N_FFT // 2, CHUNK_FRAMES), dtype=np.complex64, order="F")
+
+
+def iter_stft_chunks(y: np.ndarray, buf: np.ndarray):
+    """Yield (f0, f1, S): columns f0:f1 of np.abs(librosa.stft(y)), one chunk
+    of buf.shape[1] columns at a time, each transformed into buf.
+
+    Every chunk reads N_FFT // 2 samples past its edge frames (zeros beyond
+    the signal, like stft's centre padding), so columns straddling a chunk
+    boundary match the full transform exactly.
+    """
+    half = N_FFT // 2
+    n_cols = 1 + len(y) // HOP_LENGTH
+    for f0 in range(0, n_cols, buf.shape[1]):
+        f1 = min(f0 + buf.shape[1], n_cols)
+        start = f0 * HOP_LENGTH - half
+        stop = (f1 - 1) * HOP_LENGTH + N_FFT - half
+        seg = np.zeros(stop - start, dtype=np.float32)
+        lo, hi = max(start, 0), min(stop, len(y))
+        seg[lo - start:hi - start] = y[lo:hi]
+        D = librosa.stft(seg, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False, out=buf)
+        yield f0, f1, np.abs(D)
+
+
+def spectral_features(y: np.ndarray, stft_out: np.ndarray | None = None) -> dict:
+    """Every STFT-derived feature analyze_track needs, streamed chunk by chunk.
+
+    Each feature here reads only its own STFT column, so the (1025, n_frames)
+    magnitude matrix never materializes: peak memory is one chunk plus the
+    per-frame outputs. Chroma's tuning is the one track-wide input — it is
+    estimated from every chunk's spectral peaks exactly as chroma_stft would,
+    and chroma is then filled by a second streamed pass.
+
+    stft_out: optional complex64 (1 + N_FFT // 2, n) buffer; n sets the chunk size.
+    """
+    buf = stft_chunk_buffer() if stft_out is None else stft_out
+    n_cols = 1 + len(y) // HOP_LENGTH
+    out = {}
+
+    def put(name, f0, f1, block):
+        if name not in out:
+            out[name] = np.empty(block.shape[:-1] + (n_cols,), dtype=block.dtype)
+        out[name][..., f0:f1] = block
+
+    tuning_pitches, tuning_mags = [], []
+    for f0, f1, S in iter_stft_chunks(y, buf):
+        power = S**2
+        put("mel", f0, f1, librosa.feature.melspectrogram(S=power, sr=SR))
+        put("centroid", f0, f1, librosa.feature.spectral_centroid(S=S, sr=SR)[0])
+        put("contrast", f0, f1, librosa.feature.spectral_contrast(S=S, sr=SR, n_bands=6))
+        put("flatness", f0, f1, librosa.feature.spectral_flatness(S=S)[0])
+        put("band_energy", f0, f1, band_energy(S))
+
+        # Melodic contour: the strongest piptrack peak per frame
+        pitches, mags = librosa.piptrack(S=S, sr=SR)
+        cols = np.arange(S.shape[1])
+        best = mags.argmax(axis=0)
+        peak = mags[best, cols].astype(np.float64)
+        voiced = peak > 0
+        put("melodic_pitch", f0, f1, np.where(voiced, pitches[best, cols].astype(np.float64), 0.0))
+        put("melodic_confidence", f0, f1, np.where(voiced, peak, 0.0))
+
+        # estimate_tuning's inputs, as chroma_stft(S=power) would compute them
+        pitches, mags = librosa.piptrack(S=power, sr=SR)
+        pitched = pitches > 0
+        tuning_pitches.append(pitches[pitched])
+        tuning_mags.append(mags[pitched])
+
+    pitches = np.concatenate(tuning_pitches)
+    mags = np.concatenate(tuning_mags)
+    threshold = np.median(mags) if len(mags) else 0.0
+    tuning = librosa.pitch_tuning(pitches[mags >= threshold], resolution=0.01, bins_per_octave=12)
+
+    for f0, f1, S in iter_stft_chunks(y, buf):
+        put("chroma", f0, f1, librosa.feature.chroma_stft(S=S**2, sr=SR, tuning=tuning))
+    return out
+
+
+def estimate_key_window(chroma_vec: np.ndarray) -> tuple[int, int, float]:
+    """Returns (tonic_idx 0-11, mode 0=minor 1=major, confidence 0-1)."""
+    if chroma_vec.sum() < 1e-3:
+        return 0, 1, 0.0
+    rot = np.asarray(chroma_vec, dtype=np.float64)[_KS_ROTATION_IDX]
+    std = rot.std(axis=1, keepdims=True)
+    if not np.all(std > 0):
+        # Flat chroma — correlation is undefined
+        return 0, 1, 0.0
+    corr = ((rot - rot.mean(axis=1, keepdims=True)) / std) @ KS_PROFILES_Z.T / 12.0
+    # Row-major argmax keeps the loop's tie-break: lowest tonic, major first
+    tonic, col = np.unravel_index(corr.argmax(), corr.shape)
+    best_corr = float(corr[tonic, col])
+    # Map correlation [-1, 1] to confidence [0, 1] with a soft floor —
+    # values < 0.3 are essentially noise, values > 0.7 are strong.
+    conf = max(0.0, min(1.0, (best_corr - 0.2) / 0.6))
+    return int(tonic), 1 - int(col), conf
+
+
+def detect_sections(mel_db: np.ndarray, n_frames: int, rms_norm: np.ndarray) -> list:
+    """Detect song sections via peak-picking on an MFCC novelty curve."""
     print("Detecting sections ...")
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, hop_length=HOP_LENGTH, n_mfcc=13)
+    mfcc = librosa.feature.mfcc(S=mel_db, n_mfcc=13)
 
     # Use larger window for section-level features (~ 5 seconds)
     seg_hop = int(5 * FPS)  # 150 frames
     n_segs = max(1, n_frames // seg_hop)
 
-    # Average MFCC features per segment
+    # Average MFCC features per segment (one reduceat over all segments;
+    # the tail segment may be short if mfcc has fewer than n_segs * seg_hop frames)
     seg_features = np.zeros((n_segs, mfcc.shape[0]))
-    for i in range(n_segs):
-        start = i * seg_hop
-        end = min((i + 1) * seg_hop, mfcc.shape[1])
-        if start < mfcc.shape[1]:
-            seg_features[i] = mfcc[:, start:end].mean(axis=1)
-
-    # Cluster into sections (cap at 12 sections for a typical song)
-    n_clusters = min(max(3, n_segs // 4), 12)
-    if n_segs <= n_clusters:
-        n_clusters = max(2, n_segs - 1)
-
-    clustering = AgglomerativeClustering(
-        n_clusters=n_clusters,
-        connectivity=np.diag(np.ones(n_segs - 1), 1) + np.diag(np.ones(n_segs - 1), -1),
-    )
-    labels = clustering.fit_predict(seg_features)
+    usable = min(n_segs * seg_hop, mfcc.shape[1])
+    seg_starts = np.arange(0, usable, seg_hop)
+    if len(seg_starts) > 0:
+        seg_lens = np.diff(np.append(seg_starts, usable))
+        seg_sums = np.add.reduceat(mfcc[:, :usable], seg_starts, axis=1)
+        seg_features[:len(seg_starts)] = (seg_sums / seg_lens).T
+
+    # Target section count (cap at 12 sections for a typical song)
+    n_sections = min(max(3, n_segs // 4), 12)
+    if n_segs <= n_sections:
+        n_sections = max(2, n_segs - 1)
+
+    # Novelty = timbral distance between adjacent segments. Only adjacent
+    # segments can merge into a section, so the n_sections - 1 most prominent
+    # novelty peaks are the section boundaries — no all-pairs clustering needed.
+    novelty = np.linalg.norm(np.diff(seg_features, axis=0), axis=1)
+    peaks, props = find_peaks(novelty, prominence=0)
+    ranked = peaks[np.argsort(props["prominences"])[::-1]]
+    # find_peaks never returns endpoints and finds few maxima on short or
+    # monotone curves; top up from the largest remaining novelty values so
+    # the section count still reaches its target.
+    by_value = np.argsort(-novelty, kind="stable")
+    candidates = np.concatenate([ranked, by_value[~np.isin(by_value, ranked)]])
+    # novelty[k] measures the change from segment k to k + 1
+    boundaries = np.sort(candidates[:n_sections - 1]) + 1
+
+    # Section frame ranges tile [0, n_frames) contiguously, so one reduceat
+    # over rms_norm yields every section's mean energy.
+    frame_starts = np.concatenate([[0], boundaries * seg_hop])
+    frame_ends = np.append(np.minimum(boundaries * seg_hop, n_frames), n_frames)
+    energy_sums = np.add.reduceat(rms_norm[:n_frames], frame_starts)
+    avg_energies = energy_sums / np.maximum(frame_ends - frame_starts, 1)
 
-    # Merge consecutive segments with same label into sections
     sections = []
-    current_label = labels[0]
-    section_start = 0
-
-    for i in range(1, len(labels)):
-        if labels[i] != current_label:
-            frame_start = section_start * seg_hop
-            frame_end = min(i * seg_hop, n_frames)
-            avg_energy = float(rms_norm[frame_start:frame_end].mean()) if frame_end > frame_start else 0.0
-            energy_label = "high" if avg_energy > 0.35 else ("mid" if avg_energy > 0.15 else "low")
-            sections.append({
-                "frameStart": frame_start,
-                "frameEnd": frame_end,
-                "label": f"section_{len(sections)}",
-                "energy": energy_label,
-                "avgEnergy": round(avg_energy, 3),
-            })
-            section_start = i
-            current_label = labels[i]
-
-    # Final section
-    frame_start = section_start * seg_hop
-    frame_end = n_frames
-    avg_energy = float(rms_norm[frame_start:frame_end].mean()) if frame_end > frame_start else 0.0
-    energy_label = "high" if avg_energy > 0.35 else ("mid" if avg_energy > 0.15 else "low")
-    sections.append({
-        "frameStart": frame_start,
-        "frameEnd": frame_end,
-        "label": f"section_{len(sections)}",
-        "energy": energy_label,
-        "avgEnergy": round(avg_energy, 3),
-    })
+    for frame_start, frame_end, avg_energy in zip(
+        frame_starts.tolist(), frame_ends.tolist(), avg_energies.tolist()
+    ):
+        energy_label = "high" if avg_energy > 0.35 else ("mid" if avg_energy > 0.15 else "low")
+        sections.append({
+            "frameStart": frame_start,
+            "frameEnd": frame_end,
+            "label": f"section_{len(sections)}",
+            "energy": energy_label,
+            "avgEnergy": round(avg_energy, 3),
+        })
 
     print(f"Detected {len(sections)} sections")
     return sections
@@ -130,13 +335,13 @@ def analyze_stems(stems_dir: Path, n_frames: int) -> dict:
         return result
 
     print("Analyzing stem: bass.wav ...")
-    y_bass, _ = librosa.load(str(bass_path), sr=SR, mono=True)
+    y_bass = load_audio(bass_path)
     bass_rms = librosa.feature.rms(y=y_bass, hop_length=HOP_LENGTH)[0]
     bass_rms_norm = normalize(bass_rms)
     bass_rms_norm = pad_or_trim_1d(bass_rms_norm, n_frames)
 
     print("Analyzing stem: drums.wav ...")
-    y_drums, _ = librosa.load(str(drums_path), sr=SR, mono=True)
+    y_drums = load_audio(drums_path)
     drum_onset = librosa.onset.onset_strength(y=y_drums, sr=SR, hop_length=HOP_LENGTH)
     drum_onset_norm = normalize(drum_onset)
     drum_onset_norm = pad_or_trim_1d(drum_onset_norm, n_frames)
@@ -145,21 +350,21 @@ def analyze_stems(stems_dir: Path, n_frames: int) -> dict:
         y=y_drums, sr=SR, hop_length=HOP_LENGTH, units="frames"
     )
     drum_tempo_val = float(drum_tempo[0]) if hasattr(drum_tempo, '__len__') else float(drum_tempo)
-    drum_beat_set = set(int(b) for b in drum_beat_frames)
+    drum_beat_mask = frame_mask(drum_beat_frames, n_frames)
 
     result = {
         "available": True,
         "bassRms": bass_rms_norm,
         "drumOnset": drum_onset_norm,
-        "drumBeatSet": drum_beat_set,
+        "drumBeatMask": drum_beat_mask,
         "stemTempo": round(drum_tempo_val, 1),
     }
-    print(f"Stem analysis: bass RMS frames={len(bass_rms_norm)}, drum beats={len(drum_beat_set)}, tempo={drum_tempo_val:.1f}")
+    print(f"Stem analysis: bass RMS frames={len(bass_rms_norm)}, drum beats={int(drum_beat_mask.sum())}, tempo={drum_tempo_val:.1f}")
 
     # ── Vocals stem ──
     if vocals_path.exists():
         print("Analyzing stem: vocals.wav ...")
-        y_vocals, _ = librosa.load(str(vocals_path), sr=SR, mono=True)
+        y_vocals = load_audio(vocals_path)
         vocal_rms = librosa.feature.rms(y=y_vocals, hop_length=HOP_LENGTH)[0]
         vocal_rms_norm = normalize(vocal_rms)
         vocal_rms_norm = pad_or_trim_1d(vocal_rms_norm, n_frames)
@@ -182,7 +387,7 @@ def analyze_stems(stems_dir: Path, n_frames: int) -> dict:
     # ── Other stem (guitar/keys) ──
     if other_path.exists():
         print("Analyzing stem: other.wav ...")
-        y_other, _ = librosa.load(str(other_path), sr=SR, mono=True)
+        y_other = load_audio(other_path)
         other_rms = librosa.feature.rms(y=y_other, hop_length=HOP_LENGTH)[0]
         other_rms_norm = normalize(other_rms)
         other_rms_norm = pad_or_trim_1d(other_rms_norm, n_frames)
@@ -201,6 +406,38 @@ def analyze_stems(stems_dir: Path, n_frames: int) -> dict:
     return result
 
 
+def pack_unit(arr: np.ndarray, dtype: str) -> dict:
+    """Quantize a 0-1 feature array to little-endian unsigned ints, base64-encoded.
+
+    Decode with value = int / scale; 2D arrays are frame-major (shape order).
+    """
+    q_dtype = np.dtype(dtype)
+    scale = int(np.iinfo(q_dtype).max)
+    q = np.round(np.clip(arr, 0.0, 1.0) * scale).astype(q_dtype)
+    return {
+        "dtype": f"u{8 * q_dtype.itemsize}",
+        "scale": scale,
+        "shape": list(q.shape),
+        "data": base64.b64encode(q.tobytes()).decode("ascii"),
+    }
+
+
+def round_column(arr: np.ndarray, decimals: int) -> list:
+    """Round a feature array in one vectorized pass and convert to Python floats.
+
+    Rounds in float64 so float32 inputs don't serialize as 0.12340000271797180.
+    """
+    return np.round(np.asarray(arr, dtype=np.float64), decimals).tolist()
+
+
+def frame_mask(frame_indices: np.ndarray, n_frames: int) -> np.ndarray:
+    """Dense per-frame boolean mask from event frame indices (out-of-range dropped)."""
+    idx = np.asarray(frame_indices, dtype=np.int64)
+    mask = np.zeros(n_frames, dtype=bool)
+    mask[idx[(idx >= 0) & (idx < n_frames)]] = True
+    return mask
+
+
 def pad_or_trim_1d(arr: np.ndarray, length: int) -> np.ndarray:
     """Pad or trim a 1D array to exact length."""
     if len(arr) >= length:
@@ -208,56 +445,82 @@ def pad_or_trim_1d(arr: np.ndarray, length: int) -> np.ndarray:
     return np.pad(arr, (0, length - len(arr)), mode="edge")
 
 
-def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None = None):
-    """Full analysis pipeline for a single track."""
+def analyze_track(
+    audio_path: Path,
+    output_path: Path,
+    stems_dir: Path | None = None,
+    stft_out: np.ndarray | None = None,
+):
+    """Full analysis pipeline for a single track.
+
+    stft_out: optional complex64 chunk buffer (see stft_chunk_buffer). Batch
+    callers pass one per process so every track's STFT reuses it.
+    """
     if not audio_path.exists():
         print(f"ERROR: Audio file not found: {audio_path}", file=sys.stderr)
         sys.exit(1)
 
     print(f"Loading {audio_path} ...")
-    y, sr = librosa.load(str(audio_path), sr=SR, mono=True)
+    # float32 end-to-end: halves memory traffic through every feature pass
+    # and matches the complex64 stft_out buffer
+    y = load_audio(audio_path)
+    sr = SR
     duration = len(y) / sr
     n_frames = int(np.ceil(duration * FPS))
     stem_data = None  # initialized here; populated later if stems_dir is provided
     print(f"Duration: {duration:.1f}s | Frames: {n_frames} | SR: {sr}")
 
+    # --- Spectral features (streamed STFT, shared by every feature below) ---
+    # Each librosa feature called with y= runs its own STFT; spectral_features
+    # streams the signal through the FFT in ~30 s chunks and reduces each
+    # chunk to per-frame features, so the full spectrogram never materializes.
+    print("Computing STFT features (chunked) ...")
+    spec = spectral_features(y, stft_out)
+    # Log-power mel spectrogram — the same input onset_strength(y=) and
+    # mfcc(y=) build internally, shared by onsets, beats and all MFCC passes.
+    mel_db = librosa.power_to_db(spec["mel"])
+
     # --- RMS energy ---
     print("Computing RMS energy ...")
+    # Time-domain framing — rms(y=) never ran an STFT, and the Hann-windowed
+    # rms(S=) variant shifts the calibrated dynamicRange/spaceScore inputs.
     rms = librosa.feature.rms(y=y, hop_length=HOP_LENGTH)[0]
     rms_norm = normalize(rms)
 
     # --- Spectral centroid ---
     print("Computing spectral centroid ...")
-    cent = librosa.feature.spectral_centroid(y=y, sr=sr, hop_length=HOP_LENGTH)[0]
-    cent_norm = normalize(cent)
+    cent_norm = normalize(spec["centroid"])
 
     # --- Onset strength envelope ---
     print("Computing onset strength ...")
-    onset_env = librosa.onset.onset_strength(y=y, sr=sr, hop_length=HOP_LENGTH)
+    onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=HOP_LENGTH)
     onset_norm = normalize(onset_env)
 
     # --- Beat tracking ---
     print("Tracking beats ...")
+    # beat_track(y=) aggregates its onset envelope with a median, not a mean
+    beat_onset_env = librosa.onset.onset_strength(
+        S=mel_db, sr=sr, hop_length=HOP_LENGTH, aggregate=np.median
+    )
     tempo, beat_frames = librosa.beat.beat_track(
-        y=y, sr=sr, hop_length=HOP_LENGTH, units="frames"
+        onset_envelope=beat_onset_env, sr=sr, hop_length=HOP_LENGTH, units="frames"
     )
     # librosa >= 0.10 returns tempo as ndarray
     tempo_val = float(tempo[0]) if hasattr(tempo, '__len__') else float(tempo)
-    beat_set = set(int(b) for b in beat_frames)
-    print(f"Tempo: {tempo_val:.1f} BPM | Beats: {len(beat_set)}")
+    beat_mask = frame_mask(beat_frames, n_frames)
+    print(f"Tempo: {tempo_val:.1f} BPM | Beats: {int(beat_mask.sum())}")
 
     # --- Adaptive beat tracking: per-frame local tempo ---
     print("Computing local tempo (8s sliding window) ...")
-    onset_str = librosa.onset.onset_strength(y=y, sr=sr, hop_length=HOP_LENGTH)
     win_frames = int(8 * FPS)  # 8 second window
     local_tempo_arr = np.full(n_frames, tempo_val, dtype=np.float64)
     beat_confidence_arr = np.zeros(n_frames, dtype=np.float64)
     for i in range(0, n_frames, win_frames // 2):  # 50% overlap
         lo_f = max(0, i - win_frames // 2)
-        hi_f = min(len(onset_str), i + win_frames // 2)
+        hi_f = min(len(onset_env), i + win_frames // 2)
         if hi_f - lo_f < FPS:  # minimum 1s window
             continue
-        window_onset = onset_str[lo_f:hi_f]
+        window_onset = onset_env[lo_f:hi_f]
         try:
             local_t = librosa.beat.tempo(onset_envelope=window_onset, sr=sr, hop_length=HOP_LENGTH)
             lt = float(local_t[0]) if hasattr(local_t, '__len__') else float(local_t)
@@ -279,26 +542,18 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
 
     # --- Downbeat detection ---
     print("Detecting downbeats ...")
-    downbeat_set = set()
+    downbeat_mask = np.zeros(n_frames, dtype=bool)
     if len(beat_frames) >= 4:
         # Estimate beats per measure from tempo (assume 4/4)
         beats_per_measure = 4
-        for bi in range(0, len(beat_frames), beats_per_measure):
-            downbeat_set.add(int(beat_frames[bi]))
-    print(f"Local tempo range: {local_tempo_arr.min():.1f}-{local_tempo_arr.max():.1f} BPM | Downbeats: {len(downbeat_set)}")
+        downbeat_mask = frame_mask(beat_frames[::beats_per_measure], n_frames)
+    print(f"Local tempo range: {local_tempo_arr.min():.1f}-{local_tempo_arr.max():.1f} BPM | Downbeats: {int(downbeat_mask.sum())}")
 
     # --- Melodic contour (pitch tracking via piptrack) ---
     print("Extracting melodic contour ...")
-    pitches, magnitudes = librosa.piptrack(y=y, sr=sr, hop_length=HOP_LENGTH)
-    # Pick the pitch with highest magnitude per frame
-    melodic_pitch = np.zeros(pitches.shape[1])
-    melodic_confidence = np.zeros(pitches.shape[1])
-    for t in range(pitches.shape[1]):
-        mag_col = magnitudes[:, t]
-        idx_max = mag_col.argmax()
-        if mag_col[idx_max] > 0:
-            melodic_pitch[t] = pitches[idx_max, t]
-            melodic_confidence[t] = mag_col[idx_max]
+    # Pitch with highest piptrack magnitude per frame (picked per chunk)
+    melodic_pitch = spec["melodic_pitch"]
+    melodic_confidence = spec["melodic_confidence"]
     # Convert Hz to MIDI-like 0-1 range (27.5 Hz = A0 = 0, 4186 Hz = C8 = 1)
     melodic_pitch_norm = np.zeros_like(melodic_pitch)
     nonzero = melodic_pitch > 0
@@ -316,36 +571,18 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
     melodic_direction = pad_or_trim_1d(melodic_direction, n_frames)
     print(f"Melodic contour: {np.count_nonzero(melodic_pitch_norm)} pitched frames / {n_frames} total")
 
-    # --- Chroma CQT (compute early — needed by chord detection below) ---
+    # --- Chroma (compute early — needed by chord detection below) ---
     # Note: chroma is also used later for pad/trim alignment. We assign it here
     # so chord detection has it available, and it gets pad_or_trim_2d'd later.
-    print("Computing chroma CQT (early pass for chord detection) ...")
-    chroma = librosa.feature.chroma_cqt(y=y, sr=sr, hop_length=HOP_LENGTH)
+    # chroma_stft on the shared power spectrogram instead of chroma_cqt: the
+    # CQT's recursive resampling was the most expensive transform in the
+    # pipeline, and STFT chroma is adequate for per-frame visualizer data.
+    print("Computing chroma (early pass for chord detection) ...")
+    chroma = spec["chroma"]
 
     # --- Chord progression detection (chroma-based) ---
     print("Detecting chord progressions ...")
-    # Use 24 chord templates (12 major + 12 minor)
-    chord_names = []
-    note_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-    major_template = np.array([1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0], dtype=float)
-    minor_template = np.array([1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0], dtype=float)
-    chord_templates = []
-    for i in range(12):
-        chord_templates.append(np.roll(major_template, i))
-        chord_names.append(f"{note_names[i]}")
-        chord_templates.append(np.roll(minor_template, i))
-        chord_names.append(f"{note_names[i]}m")
-    chord_templates = np.array(chord_templates)  # (24, 12)
-
-    # Unit-normalize the templates so the dot product against a unit-normalized
-    # chroma vector is true cosine similarity, bounded in [0, 1] for non-negative
-    # inputs. Without this normalization the templates have L2 norm sqrt(3) and
-    # scores reach ~1.73 — confidence bleeds past 1.0 (mean 1.19 on Veneta), all
-    # downstream `> 0.3` / `> 0.6` thresholds become meaningless, and the
-    # smoothstep(0.3, 0.6, x) used in 8 shaders saturates regardless of true
-    # match quality. argmax is preserved (uniform scaling doesn't change ranking).
-    chord_template_norms = np.linalg.norm(chord_templates, axis=1, keepdims=True)
-    chord_templates_n = chord_templates / (chord_template_norms + 1e-8)
+    # 24 unit-normalized chord templates: module-level CHORD_TEMPLATES_N / CHORD_NAMES
 
     # Smooth chroma over ~0.5s window for chord stability
     chroma_smooth_win = max(1, int(FPS * 0.5))
@@ -365,7 +602,7 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
         frame_chroma_n = frame_chroma / (np.linalg.norm(frame_chroma) + 1e-8)
         # Cosine similarity (both vectors unit-normalized) → bounded in [0, 1]
         # for non-negative chroma. Defensive clip handles any FP edge.
-        scores = chord_templates_n @ frame_chroma_n
+        scores = CHORD_TEMPLATES_N @ frame_chroma_n
         best_idx = scores.argmax()
         chord_idx_arr[t] = best_idx
         chord_confidence_arr[t] = float(np.clip(scores[best_idx], 0.0, 1.0))
@@ -381,7 +618,7 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
         harmonic_tension_arr[t] = min(1.0, changes / (hi_t - lo_t))
 
     # Convert chord indices to string labels for metadata
-    chord_label_arr = [chord_names[int(c)] for c in chord_idx_arr]
+    chord_label_arr = [CHORD_NAMES[int(c)] for c in chord_idx_arr]
     harmonic_tension_arr = pad_or_trim_1d(harmonic_tension_arr, n_frames)
     chord_confidence_arr = pad_or_trim_1d(chord_confidence_arr, n_frames)
     print(f"Chord detection: {len(set(chord_label_arr))} unique chords, avg tension={harmonic_tension_arr.mean():.3f}")
@@ -393,39 +630,6 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
     # Source: same algorithm exists in analyze_audio.py:16-40 but was never
     # integrated into the main pipeline (audit Tier 3).
     print("Detecting song key (Krumhansl-Schmuckler) ...")
-    KS_MAJOR = np.array(
-        [6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
-    )
-    KS_MINOR = np.array(
-        [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
-    )
-
-    def estimate_key_window(chroma_vec):
-        """Returns (tonic_idx 0-11, mode 0=minor 1=major, confidence 0-1)."""
-        s = chroma_vec.sum()
-        if s < 1e-3:
-            return 0, 1, 0.0
-        norm = chroma_vec / s
-        best_corr = -2.0
-        best_tonic = 0
-        best_mode = 1
-        for i in range(12):
-            rotated = np.roll(norm, -i)
-            cm = float(np.corrcoef(rotated, KS_MAJOR)[0, 1])
-            cn = float(np.corrcoef(rotated, KS_MINOR)[0, 1])
-            if cm > best_corr:
-                best_corr = cm
-                best_tonic = i
-                best_mode = 1
-            if cn > best_corr:
-                best_corr = cn
-                best_tonic = i
-                best_mode = 0
-        # Map correlation [-1, 1] to confidence [0, 1] with a soft floor —
-        # values < 0.3 are essentially noise, values > 0.7 are strong.
-        conf = max(0.0, min(1.0, (best_corr - 0.2) / 0.6))
-        return best_tonic, best_mode, conf
-
     key_window_frames = int(5 * FPS)  # 5s windows
     key_tonic_arr = np.zeros(n_frames, dtype=float)
     key_mode_arr = np.zeros(n_frames, dtype=float)
@@ -520,22 +724,23 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
     # --- Structural semantics (self-similarity matrix → section labels) ---
     print("Computing structural semantics ...")
     # Build self-similarity from MFCC features
-    mfcc_full = librosa.feature.mfcc(y=y, sr=sr, hop_length=HOP_LENGTH, n_mfcc=13)
+    mfcc_full = librosa.feature.mfcc(S=mel_db, n_mfcc=13)
     # Downsample to ~2Hz for tractable similarity matrix
     ds_factor = max(1, FPS // 2)
     mfcc_ds = mfcc_full[:, ::ds_factor]
     n_ds = mfcc_ds.shape[1]
-    # Cosine self-similarity
+    # Cosine self-similarity, unit-normalized per column
     mfcc_norms = np.linalg.norm(mfcc_ds, axis=0, keepdims=True)
     mfcc_unit = mfcc_ds / (mfcc_norms + 1e-8)
-    ssm = mfcc_unit.T @ mfcc_unit  # (n_ds, n_ds)
 
     # Diagonal-band energy: high diagonal = repeating (verse/chorus), low = unique (bridge/solo)
+    # Only the first 30s of lag diagonals are read, so compute that band
+    # directly instead of the dense (n_ds, n_ds) matrix (~100 MB for a 3-hour
+    # show): the lag-L diagonal is the column-wise dot of unit[:, :-L] and unit[:, L:].
     section_type_arr = ["jam"] * n_frames
     diag_energy = np.zeros(n_ds)
     for lag in range(1, min(n_ds, int(30 * FPS / ds_factor))):  # up to 30s lags
-        diag = np.diagonal(ssm, offset=lag)
-        diag_energy[:len(diag)] += diag
+        diag_energy[:n_ds - lag] += np.einsum("ij,ij->j", mfcc_unit[:, :-lag], mfcc_unit[:, lag:])
 
     if n_ds > 0:
         diag_energy_norm = normalize(diag_energy)
@@ -582,34 +787,23 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
     type_counts = Counter(section_type_arr)
     print(f"Structural semantics: {dict(type_counts)}")
 
-    # --- STFT (shared for band energy + spectral contrast + flatness) ---
-    print("Computing STFT ...")
-    S = np.abs(librosa.stft(y, hop_length=HOP_LENGTH))
-    freqs = librosa.fft_frequencies(sr=sr)
-
     # --- Band energy (4 bands) ---
     print("Computing band energy ...")
-    sub = normalize(band_energy(S, freqs, 0, 100))
-    low = normalize(band_energy(S, freqs, 100, 400))
-    mid = normalize(band_energy(S, freqs, 400, 2000))
-    high = normalize(band_energy(S, freqs, 2000, 8000))
+    sub, low, mid, high = normalize_rows(spec["band_energy"])
 
-    # --- Chroma CQT (12 pitch classes) ---
+    # --- Chroma (12 pitch classes) ---
     # (already computed earlier for chord detection — reusing)
     # chroma shape: (12, n_chroma_frames) — already 0-1 range
 
     # --- Spectral contrast (7 bands) ---
     print("Computing spectral contrast ...")
-    contrast = librosa.feature.spectral_contrast(S=S, sr=sr, n_bands=6)
+    contrast = spec["contrast"]
     # contrast shape: (7, n_frames) — normalize each band independently
-    contrast_norm = np.zeros_like(contrast)
-    for b in range(contrast.shape[0]):
-        contrast_norm[b] = normalize(contrast[b])
+    contrast_norm = normalize_rows(contrast)
 
     # --- Spectral flatness ---
     print("Computing spectral flatness ...")
-    flatness = librosa.feature.spectral_flatness(S=S)[0]
-    flatness_norm = normalize(flatness)
+    flatness_norm = normalize(spec["flatness"])
 
     # --- Align all arrays to n_frames ---
     def pad_or_trim_2d(arr: np.ndarray, length: int) -> np.ndarray:
@@ -669,7 +863,7 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
           f"music frames={int((music_score_arr > 0.5).sum())}")
 
     # --- Section detection ---
-    sections = detect_sections(y, sr, n_frames, rms_norm)
+    sections = detect_sections(mel_db, n_frames, rms_norm)
 
     # --- Optional stem analysis ---
     stem_data = None
@@ -740,7 +934,7 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
 
     # Timbral brightness: high MFCC bins / total ratio (0-1)
     print("Computing timbral brightness ...")
-    mfcc_brightness = librosa.feature.mfcc(y=y, sr=sr, hop_length=HOP_LENGTH, n_mfcc=20)
+    mfcc_brightness = librosa.feature.mfcc(S=mel_db, n_mfcc=20)
     # High MFCC bins (10-19) vs total energy
     high_mfcc = np.abs(mfcc_brightness[10:, :]).sum(axis=0)
     total_mfcc = np.abs(mfcc_brightness).sum(axis=0) + 1e-8
@@ -762,7 +956,7 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
     vocals_path = (stems_dir / "vocals.wav") if stems_dir else Path("nonexistent")
     if stem_data and stem_data["available"] and vocals_path.exists():
         print("Extracting vocal melody (piptrack on vocal stem) ...")
-        y_vocals_pitch, _ = librosa.load(str(vocals_path), sr=SR, mono=True)
+        y_vocals_pitch = load_audio(vocals_path)
         vp_pitches, vp_mags = librosa.piptrack(y=y_vocals_pitch, sr=SR, hop_length=HOP_LENGTH)
         for t in range(min(vp_pitches.shape[1], n_frames)):
             mag_col = vp_mags[:, t]
@@ -785,78 +979,82 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
           f"timbralFlux mean={timbral_flux_arr.mean():.3f}")
 
     # --- Build output ---
+    # Round each feature column in one numpy pass and convert with .tolist(),
+    # then zip the columns into per-frame dicts. The frames[] schema consumed
+    # by the visualizer is unchanged; only the per-element float()/round()
+    # calls are gone.
     print("Building JSON ...")
-    frames = []
-    for i in range(n_frames):
-        frame = {
-            "rms": round(float(rms_norm[i]), 4),
-            "centroid": round(float(cent_norm[i]), 4),
-            "onset": round(float(onset_norm[i]), 4),
-            "beat": i in beat_set,
-            "sub": round(float(sub[i]), 4),
-            "low": round(float(low[i]), 4),
-            "mid": round(float(mid[i]), 4),
-            "high": round(float(high[i]), 4),
-            "chroma": [round(float(chroma[c, i]), 3) for c in range(12)],
-            "contrast": [round(float(contrast_norm[c, i]), 3) for c in range(7)],
-            "flatness": round(float(flatness_norm[i]), 4),
-            "localTempo": round(float(local_tempo_arr[i]), 1),
-            "beatConfidence": round(float(beat_confidence_arr[i]), 3),
-            "downbeat": i in downbeat_set,
-            "melodicPitch": round(float(melodic_pitch_norm[i]), 4),
-            "melodicConfidence": round(float(melodic_confidence_norm[i]), 3),
-            "melodicDirection": round(float(melodic_direction[i]), 3),
-            "chordIndex": int(chord_idx_arr[i]),
-            "chordConfidence": round(float(chord_confidence_arr[i]), 3),
-            "harmonicTension": round(float(harmonic_tension_arr[i]), 3),
-            "sectionType": section_type_arr[i],
-            "improvisationScore": round(float(improv_arr[i]), 3),
-            "tempoDerivative": round(float(tempo_derivative_arr[i]), 4),
-            "dynamicRange": round(float(dynamic_range_arr[i]), 4),
-            "spaceScore": round(float(space_score_arr[i]), 4),
-            "timbralBrightness": round(float(timbral_brightness_arr[i]), 4),
-            "timbralFlux": round(float(timbral_flux_arr[i]), 4),
-            "vocalPitch": round(float(vocal_pitch_arr[i]), 4),
-            "vocalPitchConfidence": round(float(vocal_pitch_conf_arr[i]), 4),
-            # Krumhansl-Schmuckler key detection (Tier 3)
-            "keyTonic": round(float(key_tonic_arr[i]), 4),       # 0..1 normalized 0-11 tonic index
-            "keyMode": round(float(key_mode_arr[i]), 1),         # 0=minor, 1=major
-            "keyConfidence": round(float(key_confidence_arr[i]), 3),
-            "keyChange": int(key_change_arr[i]),                  # 1 only on key-change boundary frame
-            # Silence / applause classifier (Tier 3)
-            "silenceScore": round(float(silence_score_arr[i]), 3),
-            "applauseScore": round(float(applause_score_arr[i]), 3),
-            "musicScore": round(float(music_score_arr[i]), 3),
-        }
-        # Add stem-specific fields when available
-        if stem_data and stem_data["available"]:
-            bass_rms = float(stem_data["bassRms"][i])
-            frame["stemBassRms"] = round(bass_rms, 4)
-            frame["stemDrumOnset"] = round(float(stem_data["drumOnset"][i]), 4)
-            frame["stemDrumBeat"] = i in stem_data["drumBeatSet"]
-            vocal_rms = 0.0
-            other_rms = 0.0
-            if "vocalRms" in stem_data:
-                vocal_rms = float(stem_data["vocalRms"][i])
-                frame["stemVocalRms"] = round(vocal_rms, 4)
-                frame["stemVocalPresence"] = bool(stem_data["vocalPresence"][i])
-            if "otherRms" in stem_data:
-                other_rms = float(stem_data["otherRms"][i])
-                frame["stemOtherRms"] = round(other_rms, 4)
-                frame["stemOtherCentroid"] = round(float(stem_data["otherCentroid"][i]), 4)
-            # Vocal-vs-instrumental ratio (Tier 3): vocalEnergyRatio of total
-            # tonal-source energy (vocal + other + bass). Drums excluded
-            # because they're not part of the "who's playing what" signal.
-            # 1.0 = pure vocal (Garcia singing acapella), 0.0 = pure instrumental
-            # (Garcia soloing or band jamming), 0.5 = balanced. Distinguishes
-            # "Jerry sings" from "Jerry solos" — useful for vocal-aware
-            # routing/grading.
-            tonal_total = vocal_rms + other_rms + bass_rms
-            if tonal_total > 1e-4:
-                frame["vocalEnergyRatio"] = round(vocal_rms / tonal_total, 4)
-            else:
-                frame["vocalEnergyRatio"] = 0.0
-        frames.append(frame)
+    columns = {
+        "rms": round_column(rms_norm, 4),
+        "centroid": round_column(cent_norm, 4),
+        "onset": round_column(onset_norm, 4),
+        "beat": beat_mask.tolist(),
+        "sub": round_column(sub, 4),
+        "low": round_column(low, 4),
+        "mid": round_column(mid, 4),
+        "high": round_column(high, 4),
+        "chroma": round_column(chroma[:12, :n_frames].T, 3),
+        "contrast": round_column(contrast_norm[:7, :n_frames].T, 3),
+        "flatness": round_column(flatness_norm, 4),
+        "localTempo": round_column(local_tempo_arr, 1),
+        "beatConfidence": round_column(beat_confidence_arr, 3),
+        "downbeat": downbeat_mask.tolist(),
+        "melodicPitch": round_column(melodic_pitch_norm, 4),
+        "melodicConfidence": round_column(melodic_confidence_norm, 3),
+        "melodicDirection": round_column(melodic_direction, 3),
+        "chordIndex": chord_idx_arr[:n_frames].astype(int).tolist(),
+        "chordConfidence": round_column(chord_confidence_arr, 3),
+        "harmonicTension": round_column(harmonic_tension_arr, 3),
+        "sectionType": section_type_arr[:n_frames],
+        "improvisationScore": round_column(improv_arr, 3),
+        "tempoDerivative": round_column(tempo_derivative_arr, 4),
+        "dynamicRange": round_column(dynamic_range_arr, 4),
+        "spaceScore": round_column(space_score_arr, 4),
+        "timbralBrightness": round_column(timbral_brightness_arr, 4),
+        "timbralFlux": round_column(timbral_flux_arr, 4),
+        "vocalPitch": round_column(vocal_pitch_arr, 4),
+        "vocalPitchConfidence": round_column(vocal_pitch_conf_arr, 4),
+        # Krumhansl-Schmuckler key detection (Tier 3)
+        "keyTonic": round_column(key_tonic_arr, 4),       # 0..1 normalized 0-11 tonic index
+        "keyMode": round_column(key_mode_arr, 1),         # 0=minor, 1=major
+        "keyConfidence": round_column(key_confidence_arr, 3),
+        "keyChange": key_change_arr[:n_frames].astype(int).tolist(),  # 1 only on key-change boundary frame
+        # Silence / applause classifier (Tier 3)
+        "silenceScore": round_column(silence_score_arr, 3),
+        "applauseScore": round_column(applause_score_arr, 3),
+        "musicScore": round_column(music_score_arr, 3),
+    }
+    # Add stem-specific fields when available
+    if stem_data and stem_data["available"]:
+        bass_rms = np.asarray(stem_data["bassRms"][:n_frames], dtype=np.float64)
+        columns["stemBassRms"] = round_column(bass_rms, 4)
+        columns["stemDrumOnset"] = round_column(stem_data["drumOnset"][:n_frames], 4)
+        columns["stemDrumBeat"] = stem_data["drumBeatMask"].tolist()
+        vocal_rms = np.zeros(n_frames)
+        other_rms = np.zeros(n_frames)
+        if "vocalRms" in stem_data:
+            vocal_rms = np.asarray(stem_data["vocalRms"][:n_frames], dtype=np.float64)
+            columns["stemVocalRms"] = round_column(vocal_rms, 4)
+            columns["stemVocalPresence"] = stem_data["vocalPresence"][:n_frames].astype(bool).tolist()
+        if "otherRms" in stem_data:
+            other_rms = np.asarray(stem_data["otherRms"][:n_frames], dtype=np.float64)
+            columns["stemOtherRms"] = round_column(other_rms, 4)
+            columns["stemOtherCentroid"] = round_column(stem_data["otherCentroid"][:n_frames], 4)
+        # Vocal-vs-instrumental ratio (Tier 3): vocalEnergyRatio of total
+        # tonal-source energy (vocal + other + bass). Drums excluded
+        # because they're not part of the "who's playing what" signal.
+        # 1.0 = pure vocal (Garcia singing acapella), 0.0 = pure instrumental
+        # (Garcia soloing or band jamming), 0.5 = balanced. Distinguishes
+        # "Jerry sings" from "Jerry solos" — useful for vocal-aware
+        # routing/grading.
+        tonal_total = vocal_rms + other_rms + bass_rms
+        has_tonal = tonal_total > 1e-4
+        ratio = np.zeros(n_frames)
+        ratio[has_tonal] = vocal_rms[has_tonal] / tonal_total[has_tonal]
+        columns["vocalEnergyRatio"] = round_column(ratio, 4)
+
+    keys = list(columns)
+    frames = [dict(zip(keys, values)) for values in zip(*columns.values())]
 
     meta = {
         "source": str(audio_path.name),
@@ -906,11 +1104,25 @@ def analyze_track(audio_path: Path, output_path: Path, stems_dir: Path | None =
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(output, f)
+    write_json(output_path, output)
 
     size_mb = output_path.stat().st_size / (1024 * 1024)
     print(f"Wrote {output_path} ({size_mb:.1f} MB, {n_frames} frames)")
+
+    # Opt-in quantized sidecar. The frames[] schema above is what the
+    # visualizer scripts read, so it stays the canonical output.
+    if os.environ.get("DEAD_AIR_PACKED_FEATURES") == "1":
+        packed_path = output_path.with_suffix(".packed.json")
+        unit_features = {
+            "rms": rms_norm, "centroid": cent_norm, "onset": onset_norm,
+            "sub": sub, "low": low, "mid": mid, "high": high, "flatness": flatness_norm,
+        }
+        packed = {name: pack_unit(arr[:n_frames], "<u2") for name, arr in unit_features.items()}
+        packed["chroma"] = pack_unit(chroma[:, :n_frames].T, "u1")
+        packed["contrast"] = pack_unit(contrast_norm[:, :n_frames].T, "u1")
+        write_json(packed_path, {"meta": {"source": meta["source"], "fps": FPS, "totalFrames": n_frames}, "features": packed})
+        print(f"Wrote {packed_path} ({packed_path.stat().st_size / (1024 * 1024):.1f} MB, packed)")
+
     return output
 
 
@@ -931,6 +1143,8 @@ def main():
                 sys.stdout.write(f.read())
         finally:
             tmp_path.unlink(missing_ok=True)
+            # DEAD_AIR_PACKED_FEATURES sidecar has no consumer in this mode
+            tmp_path.with_suffix(".packed.json").unlink(missing_ok=True)
         return
 
     if len(sys.argv) >= 3:
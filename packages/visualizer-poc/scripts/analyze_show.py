@@ -4,7 +4,10 @@ Batch audio analysis for a full show.
 Runs analyze.py on all tracks in the setlist and generates a show timeline.
 
 Usage:
-  python analyze_show.py [--resume] [--audio-dir=/path/to/audio]
+  python analyze_show.py [--resume] [--audio-dir=/path/to/audio] [--workers=N]
+
+Tracks are analyzed in parallel worker processes (default: half the CPU
+cores); --workers=1 analyzes them serially in-process.
 
 The audio directory is resolved from (in priority order):
   1. --audio-dir CLI argument
@@ -19,11 +22,12 @@ Output:
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-# Import the single-track analyzer
+# The single-track analyzer (and with it librosa/numba) is imported only once
+# there is a track to analyze, so a fully resumed run never loads it.
 sys.path.insert(0, str(Path(__file__).parent))
-from analyze import analyze_track
 
 # Support env var overrides for Docker (fall back to relative paths for local dev)
 _DATA_DIR_ENV = os.environ.get("DEAD_AIR_DATA_DIR")
@@ -36,19 +40,65 @@ SETLIST_PATH = DATA_DIR / "setlist.json"
 PUBLIC_AUDIO_DIR = Path(_AUDIO_DIR_ENV) if _AUDIO_DIR_ENV else Path(__file__).resolve().parent.parent / "public" / "audio"
 
 FPS = 30
+# Workers default to half the cores, each with a 2-thread BLAS pool, so
+# numpy/librosa internals don't oversubscribe the machine.
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+BLAS_THREADS_PER_WORKER = 2
+
+# Per-process STFT chunk buffer, reused by every track analyzed in this process
+_STFT_BUF = None
+
+
+def _allocate_stft_buffer():
+    global _STFT_BUF
+    from analyze import stft_chunk_buffer
+    _STFT_BUF = stft_chunk_buffer()
+
+
+def _init_worker(blas_threads: int):
+    """ProcessPoolExecutor initializer: cap BLAS threads, allocate the STFT
+    chunk buffer, and warm librosa's numba kernels before the first real track."""
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=blas_threads)
+    except ImportError:
+        pass
+    from analyze import warm_up
+    _allocate_stft_buffer()
+    warm_up()
+
+
+def _analyze_song(track_id: str, title: str, audio_path: Path, output_path: Path,
+                  stems_dir: Path | None) -> tuple[int, float]:
+    """Analyze one track (writes its own JSON) and return (totalFrames, duration).
+
+    Only the metadata crosses the process boundary — the full frame data
+    stays on disk.
+    """
+    print(f"\n{'='*60}")
+    print(f"Analyzing: {title} ({track_id})")
+    print(f"{'='*60}")
+    if stems_dir:
+        print(f"  Stems found: {stems_dir}")
+    from analyze import analyze_track
+    result = analyze_track(audio_path, output_path, stems_dir, stft_out=_STFT_BUF)
+    return result["meta"]["totalFrames"], result["meta"]["duration"]
 
 
 def main():
     resume = "--resume" in sys.argv
 
-    # Parse --audio-dir and --stems-dir arguments
+    # Parse --audio-dir, --stems-dir and --workers arguments
     cli_audio_dir = None
     cli_stems_dir = None
+    workers = DEFAULT_WORKERS
     for arg in sys.argv[1:]:
         if arg.startswith("--audio-dir="):
             cli_audio_dir = Path(arg.split("=", 1)[1])
         elif arg.startswith("--stems-dir="):
             cli_stems_dir = Path(arg.split("=", 1)[1])
+        elif arg.startswith("--workers="):
+            workers = max(1, int(arg.split("=", 1)[1]))
 
     # Load setlist
     with open(SETLIST_PATH) as f:
@@ -76,10 +126,10 @@ def main():
 
     TRACKS_DIR.mkdir(parents=True, exist_ok=True)
 
-    timeline_tracks = []
-    global_offset = 0
-    total_duration = 0.0
-
+    # Resolve which songs need analysis; missing and resumed tracks are
+    # settled here so only real work is dispatched to the pool.
+    jobs = []          # (track_id, title, audio_path, output_path, stems_dir)
+    track_meta = {}    # track_id -> (total_frames, duration)
     for song in setlist["songs"]:
         track_id = song["trackId"]
         audio_file = song["audioFile"]
@@ -88,6 +138,53 @@ def main():
 
         if not audio_path.exists():
             print(f"SKIP: {audio_file} not found at {audio_path}")
+            continue
+
+        if resume and output_path.exists():
+            print(f"RESUME: {track_id} already analyzed, loading metadata ...")
+            with open(output_path) as f:
+                existing = json.load(f)
+            track_meta[track_id] = (existing["meta"]["totalFrames"], existing["meta"]["duration"])
+            continue
+
+        # Auto-detect stems dir for this track
+        track_stems_dir = stems_base / track_id
+        stems_dir = track_stems_dir if track_stems_dir.is_dir() else None
+        jobs.append((track_id, song["title"], audio_path, output_path, stems_dir))
+
+    # The STFT is streamed in fixed-size chunks, so one small buffer per
+    # process serves every track regardless of length.
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        if jobs:
+            _allocate_stft_buffer()
+        for job in jobs:
+            track_meta[job[0]] = _analyze_song(*job)
+    else:
+        print(f"\nAnalyzing {len(jobs)} tracks on {workers} workers ({BLAS_THREADS_PER_WORKER} BLAS threads each)")
+        # Children spawned fresh read these before importing numpy; forked
+        # children are capped by threadpoolctl in _init_worker instead.
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ.setdefault(var, str(BLAS_THREADS_PER_WORKER))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(BLAS_THREADS_PER_WORKER,),
+        ) as pool:
+            futures = {pool.submit(_analyze_song, *job): job[0] for job in jobs}
+            for n_done, future in enumerate(as_completed(futures), 1):
+                track_id = futures[future]
+                track_meta[track_id] = future.result()
+                print(f"Done: {track_id} ({n_done}/{len(jobs)})")
+
+    # Assemble the timeline in setlist order regardless of completion order
+    timeline_tracks = []
+    global_offset = 0
+    total_duration = 0.0
+
+    for song in setlist["songs"]:
+        track_id = song["trackId"]
+        if track_id not in track_meta:
             # Still advance timeline with placeholder
             timeline_tracks.append({
                 "trackId": track_id,
@@ -98,25 +195,7 @@ def main():
             })
             continue
 
-        if resume and output_path.exists():
-            print(f"RESUME: {track_id} already analyzed, loading metadata ...")
-            with open(output_path) as f:
-                existing = json.load(f)
-            total_frames = existing["meta"]["totalFrames"]
-            track_duration = existing["meta"]["duration"]
-        else:
-            print(f"\n{'='*60}")
-            print(f"Analyzing: {song['title']} ({track_id})")
-            print(f"{'='*60}")
-            # Auto-detect stems dir for this track
-            track_stems_dir = stems_base / track_id
-            stems_dir = track_stems_dir if track_stems_dir.is_dir() else None
-            if stems_dir:
-                print(f"  Stems found: {stems_dir}")
-            result = analyze_track(audio_path, output_path, stems_dir)
-            total_frames = result["meta"]["totalFrames"]
-            track_duration = result["meta"]["duration"]
-
+        total_frames, track_duration = track_meta[track_id]
         timeline_tracks.append({
             "trackId": track_id,
             "globalFrameStart": global_offset,